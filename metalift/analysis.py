@@ -36,6 +36,12 @@ from typing import (
     cast,
 )
 
+# compiled once: these run per line of the loop-analysis dump and per global
+_LOOP_RE = re.compile("Loop at depth \d+ containing: (\S+)")
+_BLOCK_NAME_RE = re.compile("([^<]+)")
+_STRING_TYPE_RE = re.compile("\[. x i8\]\*")
+_STRING_VALUE_RE = re.compile('"(.+)"')
+
 orig_value_ref_operands = ValueRef.operands
 
 
@@ -155,7 +161,7 @@ def parseLoops(filename: str, fnName: str, log: bool = True) -> List[LoopInfo]:
             ):
                 found = True
             elif found:
-                loopMatch = re.match("Loop at depth \d+ containing: (\S+)", l.strip())
+                loopMatch = _LOOP_RE.match(l.strip())
                 if loopMatch:
                     foundLines.append(loopMatch.group(1))
                 elif re.match(
@@ -173,7 +179,7 @@ def parseLoops(filename: str, fnName: str, log: bool = True) -> List[LoopInfo]:
 
             blks = m.replace("%", "").split(",")
             for b in blks:
-                name: str = re.search("([^<]+)", b).group(0)  # type: ignore
+                name: str = _BLOCK_NAME_RE.search(b).group(0)  # type: ignore
                 if log:
                     print("name: %s" % b)
                 if "<header>" in b:
@@ -342,8 +348,8 @@ def parseGlobals(
 ) -> Dict[str, ValueRef]:
     globalVars = {}
     for g in global_variables:
-        if re.search("\[. x i8\]\*", str(g.type)):  # strings have type [n x i8]*
-            o = re.search('"(.+)"', str(g))
+        if _STRING_TYPE_RE.search(str(g.type)):  # strings have type [n x i8]*
+            o = _STRING_VALUE_RE.search(str(g))
             if o:
                 v = o.group(1).replace("\\00", "")
             else:
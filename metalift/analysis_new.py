@@ -19,6 +19,11 @@ from metalift.ir import (
 from metalift import ir, models_new
 
 
+# compiled once: gen_value/gen_expr run for every operand and instruction
+_I32_LIT_RE = re.compile("i32 (\d+)")
+_ICMP_RE = re.compile("\S+ = icmp (\w+) \S+ \S+ \S+")
+
+
 def format_with_index(a: str, idx: int) -> str:
     if idx == 0:
         return a
@@ -178,45 +183,45 @@ def gen_value(value: ValueRef, fn_group: VariableGroup) -> Expr:
     if value.name:
         return fn_group.existing_variable(value.name, parseTypeRef(value.type))
     elif str(value).startswith("i32 "):
-        literal = int(re.match("i32 (\d+)", str(value).strip()).group(1))  # type: ignore
+        literal = int(_I32_LIT_RE.match(str(value).strip()).group(1))  # type: ignore
         return ir.IntLit(literal)
     else:
         raise Exception("Cannot generate value for %s" % value)
 
 
+# arithmetic opcodes map directly to their IR constructors; comparisons go
+# through lambdas since some conditions flip or reuse operands
+_ARITH_OPS: Dict[str, Callable[[Expr, Expr], Expr]] = {
+    "add": ir.Add,
+    "sub": ir.Sub,
+    "mul": ir.Mul,
+}
+
+_ICMP_OPS: Dict[str, Callable[[Expr, Expr], Expr]] = {
+    "eq": lambda op1, op2: ir.Eq(op2, op1),
+    "sgt": lambda op1, op2: ir.Lt(op2, op1),
+    "sle": lambda op1, op2: ir.Le(op1, op2),
+    "slt": lambda op1, op2: ir.Lt(op1, op2),
+    "ult": lambda op1, op2: ir.Lt(op1, op2),
+}
+
+
 def gen_expr(expr: ValueRef, fn_group: VariableGroup, env: StackEnv) -> Expr:
     opcode = expr.opcode
     operands = list(expr.operands)
     if opcode == "load":
         # TODO(shadaj): handle situations where the load results in a pointer
         return env[operands[0].name]
-    elif opcode == "add":
-        return ir.Add(
-            gen_value(operands[0], fn_group), gen_value(operands[1], fn_group)
-        )
-    elif opcode == "sub":
-        return ir.Sub(
-            gen_value(operands[0], fn_group), gen_value(operands[1], fn_group)
-        )
-    elif opcode == "mul":
-        return ir.Mul(
+    elif opcode in _ARITH_OPS:
+        return _ARITH_OPS[opcode](
             gen_value(operands[0], fn_group), gen_value(operands[1], fn_group)
         )
     elif opcode == "icmp":
-        cond = re.match("\S+ = icmp (\w+) \S+ \S+ \S+", str(expr).strip()).group(1)  # type: ignore
-        op1 = gen_value(operands[0], fn_group)
-        op2 = gen_value(operands[1], fn_group)
-
-        if cond == "eq":
-            return ir.Eq(op2, op1)
-        elif cond == "sgt":
-            return ir.Lt(op2, op1)
-        elif cond == "sle":
-            return ir.Le(op1, op2)
-        elif cond == "slt" or cond == "ult":
-            return ir.Lt(op1, op2)
-        else:
+        cond = _ICMP_RE.match(str(expr).strip()).group(1)  # type: ignore
+        build = _ICMP_OPS.get(cond)
+        if build is None:
             raise Exception("Unknown comparison operator %s" % cond)
+        return build(gen_value(operands[0], fn_group), gen_value(operands[1], fn_group))
     elif opcode == "call":
         fnName = operands[-1] if isinstance(operands[-1], str) else operands[-1].name
         if fnName == "":
@@ -0,0 +1,360 @@
+import ctypes
+import functools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from llvmlite import binding as llvm
+
+# numpy is optional: with it sample generation is vectorized, without it
+# gen_traces falls back to drawing one sample at a time
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+# numba is optional as well: it compiles the sampling+dispatch loop so each
+# trace costs a direct C call instead of going through ctypes argument
+# marshalling in the interpreter
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # type: ignore
+
+from metalift.analysis_new import AnalysisResult
+from metalift.ir import Type
+
+llvm.initialize()
+llvm.initialize_native_target()
+llvm.initialize_native_asmprinter()
+
+
+def create_execution_engine() -> Tuple[llvm.ExecutionEngine, llvm.TargetMachine]:
+    """Create an MCJIT compiler backed by an empty module."""
+    target = llvm.Target.from_default_triple()
+    target_machine = target.create_target_machine()
+    backing_mod = llvm.parse_assembly("")
+    engine = llvm.create_mcjit_compiler(backing_mod, target_machine)
+    return engine, target_machine
+
+
+_C_TYPE_MAP: Dict[str, Any] = {
+    "Int": ctypes.c_int,
+    "Bool": ctypes.c_bool,
+}
+
+
+def _meta_tpe_to_c_tpe(tpe: Type) -> Any:
+    c_tpe = _C_TYPE_MAP.get(tpe.name)
+    if c_tpe is None:
+        raise Exception("NYI: %s" % tpe)
+    return c_tpe
+
+
+class _FunctionSpec(NamedTuple):
+    """Picklable subset of AnalysisResult sent to worker processes: the full
+    result holds llvmlite ValueRefs, which cannot cross a process boundary."""
+
+    name: str
+    arguments: List[Any]
+    return_type: Type
+
+
+# compilation and trace generation only touch the name, arguments and return
+# type of an analysis, so they accept either form
+_AnalysisLike = Union[AnalysisResult, _FunctionSpec]
+
+
+# building a CFUNCTYPE allocates a fresh type object and libffi signature, so
+# memoize on the type names: synthesis loops compile many functions sharing
+# the same handful of signatures
+@functools.lru_cache(maxsize=128)
+def _make_cfunctype(type_names: Tuple[str, ...]) -> Any:
+    c_types = [_meta_tpe_to_c_tpe(Type(name)) for name in type_names]
+    return ctypes.CFUNCTYPE(*c_types)
+
+
+def _analysis_to_c_func(analysis: _AnalysisLike) -> Any:
+    names = tuple(
+        [analysis.return_type.name] + [a.type.name for a in analysis.arguments]
+    )
+    return _make_cfunctype(names)
+
+
+def create_optimizer() -> llvm.ModulePassManager:
+    """Build the -O3 pipeline that is run over every module before JITing.
+
+    MCJIT compiles whatever IR it is handed, and the unoptimized output of the
+    frontend runs inside the gen_traces sampling loop, so optimizing here pays
+    for itself many times over."""
+    pmb = llvm.create_pass_manager_builder()
+    pmb.opt_level = 3
+    pmb.loop_vectorize = True
+    pmb.slp_vectorize = True
+    pm = llvm.create_module_pass_manager()
+    pmb.populate(pm)
+    return pm
+
+
+_engine: Any = None  # lazily created, shared across compile_function calls
+_target_machine: Any = None
+_optimizer: Any = None
+
+# compiled functions cached across calls: parse_assembly and finalize_object
+# dominate compile_function, and iterative synthesis loops compile the same IR
+# over and over. The module ref is kept alive alongside the ctypes function
+# since a module must not be added to the engine twice.
+_compiled: Dict[Tuple[str, float, str], Tuple[Any, Any]] = {}
+
+
+def _parse_module(filename: str) -> Any:
+    """Parse `filename` into a module, preferring bitcode: it is smaller and
+    several times faster to parse than textual IR. Textual IR gets a `.bc`
+    sidecar written on first parse so later loads take the fast path."""
+    if filename.endswith(".bc"):
+        with open(filename, mode="rb") as file:
+            return llvm.parse_bitcode(file.read())
+
+    bc_filename = filename + ".bc"
+    try:
+        if os.path.getmtime(bc_filename) >= os.path.getmtime(filename):
+            with open(bc_filename, mode="rb") as file:
+                return llvm.parse_bitcode(file.read())
+    except OSError:
+        pass  # no sidecar yet
+
+    with open(filename, mode="r") as file:
+        mod = llvm.parse_assembly(file.read())
+    try:
+        with open(bc_filename, mode="wb") as file:
+            file.write(mod.as_bitcode())
+    except OSError:
+        pass  # read-only location; parsing the text each time still works
+    return mod
+
+
+def compile_function(filename: str, analysis: _AnalysisLike) -> Any:
+    """JIT compile the function named `analysis.name` from the LLVM IR in
+    `filename` and return it as a callable ctypes function."""
+    key = (filename, os.path.getmtime(filename), analysis.name)
+    cached = _compiled.get(key)
+    if cached is not None:
+        return cached[0]
+
+    global _engine, _target_machine, _optimizer
+    if _engine is None:
+        _engine, _target_machine = create_execution_engine()
+        _optimizer = create_optimizer()
+
+    mod = _parse_module(filename)
+    # the IR carries the triple/layout of the machine it was compiled on;
+    # retarget it to the host so MCJIT accepts the module
+    mod.triple = llvm.get_default_triple()
+    mod.data_layout = str(_target_machine.target_data)
+    mod.verify()
+    _optimizer.run(mod)
+    mod.verify()  # make sure the passes did not break the module
+    _engine.add_module(mod)
+    _engine.finalize_object()
+    _engine.run_static_constructors()
+
+    addr = _engine.get_function_address(analysis.name)
+    cfunc = _analysis_to_c_func(analysis)(addr)
+    _compiled[key] = (cfunc, mod)
+    return cfunc
+
+
+_MinInt = -(2**31)
+_MaxInt = 2**31 - 1
+_SmallIntMin = -10
+_SmallIntMax = 10
+_SpecialInt = [_MinInt, -1, 0, 1, _MaxInt]
+
+# ranges index in constant time, so random.choices can draw from the full
+# int space without materializing it
+_AllIntRange = range(_MinInt, _MaxInt + 1)
+_SmallIntRange = range(_SmallIntMin, _SmallIntMax + 1)
+
+
+class Generator:
+    """Samples concrete argument values for a function under analysis."""
+
+    def __init__(self, seed: int) -> None:
+        self.rnd = random.Random(seed)
+        self.np_rnd = np.random.default_rng(seed) if np is not None else None
+
+    def sample_int(self) -> int:
+        category = self.rnd.choice(("All", "Small", "Special"))
+        if category == "All":
+            return self.rnd.randint(_MinInt, _MaxInt)
+        elif category == "Small":
+            return self.rnd.randint(_SmallIntMin, _SmallIntMax)
+        else:
+            return self.rnd.choice(_SpecialInt)
+
+    def sample_int_batch(self, n: int) -> Any:
+        """Vectorized sample_int: draw n values with a single numpy call per
+        category instead of n Python-level choice/randint calls."""
+        rng = self.np_rnd
+        cats = rng.integers(0, 3, n)
+        alls = rng.integers(_MinInt, _MaxInt + 1, n, dtype=np.int64)
+        smalls = rng.integers(_SmallIntMin, _SmallIntMax + 1, n, dtype=np.int64)
+        specials = np.asarray(_SpecialInt, dtype=np.int64)[
+            rng.integers(0, len(_SpecialInt), n)
+        ]
+        return np.where(cats == 0, alls, np.where(cats == 1, smalls, specials))
+
+    def sample_tpe(self, tpe: Type) -> int:
+        if tpe.name == "Int":
+            return self.sample_int()
+        else:
+            raise Exception("NYI: %s" % tpe)
+
+    def sample_int_pool(self, n: int) -> List[int]:
+        """Batched sample_int without numpy: one random.choices call per
+        category instead of n choice/randint calls in the sampling loop."""
+        rnd = self.rnd
+        cats = rnd.choices(("All", "Small", "Special"), k=n)
+        alls = iter(rnd.choices(_AllIntRange, k=cats.count("All")))
+        smalls = iter(rnd.choices(_SmallIntRange, k=cats.count("Small")))
+        specials = iter(rnd.choices(_SpecialInt, k=cats.count("Special")))
+        return [
+            next(alls)
+            if c == "All"
+            else next(smalls)
+            if c == "Small"
+            else next(specials)
+            for c in cats
+        ]
+
+    def specialize(self, analysis: _AnalysisLike) -> List[Callable[[], int]]:
+        """Classify the argument types once, returning one sampler per
+        argument, so the per-sample loop skips the type dispatch."""
+        samplers: List[Callable[[], int]] = []
+        for a in analysis.arguments:
+            if a.type.name == "Int":
+                samplers.append(self.sample_int)
+            else:
+                raise Exception("NYI: %s" % a.type)
+        return samplers
+
+    def sample_args(self, analysis: _AnalysisLike) -> List[int]:
+        return [self.sample_tpe(a.type) for a in analysis.arguments]
+
+
+# compiling the dispatch loop takes a moment, so only use it when the runtime
+# phase is large enough to amortize the JIT cost
+_JIT_MIN_COUNT = 500
+
+# numba cannot unpack a runtime-sized argument list into a C call, so there is
+# one compiled loop per supported arity, built on first use and reused after
+_jit_dispatchers: Dict[int, Any] = {}
+
+
+def _jit_dispatcher(nargs: int) -> Any:
+    """Return a numba-compiled loop calling cfunc on every row of a column
+    matrix, or None if the arity is not supported."""
+    if nargs in _jit_dispatchers:
+        return _jit_dispatchers[nargs]
+
+    run: Any = None
+    if nargs == 1:
+
+        @njit
+        def run(cfunc: Any, cols: Any, out: Any) -> None:
+            for i in range(out.shape[0]):
+                out[i] = cfunc(cols[0, i])
+
+    elif nargs == 2:
+
+        @njit
+        def run(cfunc: Any, cols: Any, out: Any) -> None:
+            for i in range(out.shape[0]):
+                out[i] = cfunc(cols[0, i], cols[1, i])
+
+    elif nargs == 3:
+
+        @njit
+        def run(cfunc: Any, cols: Any, out: Any) -> None:
+            for i in range(out.shape[0]):
+                out[i] = cfunc(cols[0, i], cols[1, i], cols[2, i])
+
+    elif nargs == 4:
+
+        @njit
+        def run(cfunc: Any, cols: Any, out: Any) -> None:
+            for i in range(out.shape[0]):
+                out[i] = cfunc(cols[0, i], cols[1, i], cols[2, i], cols[3, i])
+
+    _jit_dispatchers[nargs] = run
+    return run
+
+
+def _gen_traces_worker(
+    filename: str, spec: _FunctionSpec, count: int, seed: int
+) -> List[Tuple[List[int], int]]:
+    return gen_traces(filename, spec, count=count, seed=seed)
+
+
+def gen_traces(
+    filename: str,
+    analysis: _AnalysisLike,
+    count: int = 100,
+    seed: int = 0,
+    workers: Optional[int] = None,
+) -> List[Tuple[List[int], int]]:
+    """Run the compiled function on `count` sampled inputs and collect
+    (arguments, return value) pairs. With `workers` set, the work is split
+    across that many processes, each compiling its own copy of the function
+    and sampling with its own seed; worthwhile when count is large enough to
+    amortize the per-worker JIT setup."""
+    if workers is not None and workers > 1 and count >= workers:
+        spec = _FunctionSpec(
+            analysis.name, list(analysis.arguments), analysis.return_type
+        )
+        base, rem = divmod(count, workers)
+        sizes = [base + 1] * rem + [base] * (workers - rem)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_gen_traces_worker, filename, spec, size, seed + i)
+                for i, size in enumerate(sizes)
+            ]
+            return [t for f in futures for t in f.result()]
+
+    cfunc = compile_function(filename, analysis)
+    gen = Generator(seed)
+
+    traces: List[Tuple[List[int], int]] = []
+    if np is not None and all(a.type.name == "Int" for a in analysis.arguments):
+        # draw all samples for each argument up front, one column per argument
+        cols = [gen.sample_int_batch(count) for _ in analysis.arguments]
+
+        if njit is not None and count >= _JIT_MIN_COUNT and len(cols) > 0:
+            runner = _jit_dispatcher(len(cols))
+            if runner is not None:
+                stacked = np.stack(cols)
+                rets = np.empty(count, dtype=np.int64)
+                runner(cfunc, stacked, rets)
+                # one bulk tolist per array: converting element by element
+                # pays the numpy-scalar boxing cost count times over
+                return list(zip(stacked.T.tolist(), rets.tolist()))
+
+        # convert the columns to plain int lists up front; ctypes converts
+        # Python ints on its fast path while numpy scalars go through
+        # __index__ on every call
+        cols = [c.tolist() for c in cols]
+        for i in range(count):
+            args = [c[i] for c in cols]
+            traces.append((args, cfunc(*args)))
+    elif all(a.type.name == "Int" for a in analysis.arguments):
+        cols = [gen.sample_int_pool(count) for _ in analysis.arguments]
+        for i in range(count):
+            args = [c[i] for c in cols]
+            traces.append((args, cfunc(*args)))
+    else:
+        samplers = gen.specialize(analysis)
+        for _ in range(count):
+            args = [s() for s in samplers]
+            traces.append((args, cfunc(*args)))
+    return traces
@@ -70,8 +70,6 @@ from mypy.nodes import (
 from mypy.types import CallableType, Instance, ProperType, Type as MypyType, UnboundType
 from mypy.visitor import ExpressionVisitor, NodeVisitor, StatementVisitor
 
-import copy
-
 # Run the interpreted version of mypy instead of the compiled one to avoid
 # TypeError: interpreted classes cannot inherit from compiled traits
 # from https://github.com/python/mypy
@@ -91,6 +89,25 @@ def parse(path: str, modulename: str) -> BuildResult:
 
 MypyVar = Tuple[str, MypyType]
 
+# dispatch tables for the expression visitors: a single dict lookup instead of
+# a chain of string comparisons per operator node
+_BIN_OPS: Dict[str, Callable[[Expr, Expr], Expr]] = {
+    "+": lambda l, r: l + r,
+    "-": lambda l, r: l - r,
+    "*": lambda l, r: l * r,
+    "and": And,
+    "or": Or,
+}
+
+# ">" | "<" | "==" | ">=" | "<=" | "!=" | "is" ["not"] | ["not"] "in"
+_CMP_OPS: Dict[str, Callable[[Expr, Expr], Expr]] = {
+    ">": Gt,
+    "<": Lt,
+    "==": Eq,
+    ">=": Ge,
+    "<=": Le,
+}
+
 
 class State:
     precond: List[Expr]
@@ -119,25 +136,44 @@ class State:
         self.vars[var] = val
         # print(f"[{var}] -> {val}")
 
-    # def copy(self) -> "State":
-    #     return State(self.fn,  # mypy.types.CallableType fails to deepcopy
-    #                  copy.deepcopy(self.precond),
-    #                  copy.deepcopy(self.vars),
-    #                  copy.deepcopy(self.asserts),
-    #                  self.has_returned)
+    # Exprs are never mutated once constructed, so copying a state only needs
+    # fresh containers; deep-copying the expression trees they share dominated
+    # analysis time on branch- and loop-heavy functions
+    def copy(self) -> "State":
+        return State(
+            list(self.precond),
+            dict(self.vars),
+            list(self.asserts),
+            self.has_returned,
+        )
+
+
+# tables mapping mypy type names to ir.Type constructors, so that resolving an
+# annotation is a dict lookup rather than a chain of isinstance and string tests
+_ANNOTATED_TYPES: Dict[str, Callable[[], MLType]] = {
+    "int": Int,
+    "bool": Bool,
+}
+
+_INFERRED_TYPES: Dict[str, Callable[[], MLType]] = {
+    "builtins.int": Int,
+    "builtins.bool": Bool,
+}
 
 
 def to_mltype(t: MypyType) -> MLType:
     # user annotated types
-    if isinstance(t, UnboundType) and t.name == "int":
-        return Int()
-
+    if isinstance(t, UnboundType):
+        mk = _ANNOTATED_TYPES.get(t.name)
     # inferred types
-    elif isinstance(t, Instance) and t.type.fullname == "builtins.int":
-        return Int()
-
+    elif isinstance(t, Instance):
+        mk = _INFERRED_TYPES.get(t.type.fullname)
     else:
+        mk = None
+
+    if mk is None:
         raise RuntimeError(f"unknown Mypy type: {t}")
+    return mk()
 
 
 class RWVarsVisitor(TraverserVisitor):
@@ -292,6 +328,7 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
     ps_grammar: Callable[[Var, Statement, List[Var], List[Var], List[Var]], Expr]
 
     types: Dict[MypyExpr, MypyType]
+    log: bool
 
     def __init__(
         self,
@@ -307,6 +344,7 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
         inv_grammar: Callable[[Var, Statement, List[Var], List[Var], List[Var]], Expr],
         ps_grammar: Callable[[Var, Statement, List[Var], List[Var], List[Var]], Expr],
         types: Dict[MypyExpr, MypyType],
+        log: bool = True,
     ) -> None:
         self.fn_name = fn_name
         self.fn_type = fn_type
@@ -322,6 +360,7 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
         self.inv_grammar = inv_grammar
         self.ps_grammar = ps_grammar
         self.types = types
+        self.log = log
 
     # Definitions
 
@@ -421,11 +460,12 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
     def in_scope_vars(
         self, vars: Dict[str, Expr], types: Dict[MypyExpr, MypyType]
     ) -> Set[MypyVar]:
+        # a single pass over the type map suffices: vars is a dict, so the
+        # name membership test is O(1) instead of rescanning types per var
         r = set()
-        for v in vars:
-            for k, t in types.items():
-                if isinstance(k, NameExpr) and k.name == v:
-                    r.add((v, t))
+        for k, t in types.items():
+            if isinstance(k, NameExpr) and k.name in vars:
+                r.add((k.name, t))
         return r
 
     def visit_while_stmt(self, o: WhileStmt) -> None:
@@ -441,7 +481,8 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
         in_scope = list(self.in_scope_vars(self.state.vars, self.types))
         in_scope.sort()
 
-        print(f"loop writes: {writes}, reads: {reads}, scope: {in_scope}")
+        if self.log:
+            print(f"loop writes: {writes}, reads: {reads}, scope: {in_scope}")
 
         assert None not in self.fn_type.arg_names
         formals = list(
@@ -459,7 +500,8 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
             if self.state.precond
             else inv.call(self.state)
         )
-        print(f"inv is init true: {self.state.asserts[-1]}")
+        if self.log:
+            print(f"inv is init true: {self.state.asserts[-1]}")
 
         # havoc the modified vars
         for var in v.writes:
@@ -473,13 +515,14 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
             self.ast,
             self.args,
             self.ret_val,
-            copy.deepcopy(self.state),
+            self.state.copy(),
             self.invariants,
             self.var_tracker,
             self.pred_tracker,
             self.inv_grammar,
             self.ps_grammar,
             self.types,
+            self.log,
         )
         o.body.accept(body_visitor)
 
@@ -491,7 +534,8 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
             else And(cond, inv.call(self.state))
         )
         self.state.asserts.append(Implies(c, inv.call(body_visitor.state)))
-        print(f"inv is preserved: {self.state.asserts[-1]}")
+        if self.log:
+            print(f"inv is preserved: {self.state.asserts[-1]}")
 
         # the invariant is true from this point on
         self.state.precond.append(And(Not(cond), inv.call(self.state)))
@@ -515,7 +559,8 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
         else:
             self.state.asserts.append(ps)
 
-        print(f"ps: {self.state.asserts[-1]}")
+        if self.log:
+            print(f"ps: {self.state.asserts[-1]}")
         self.state.has_returned = True
 
     def visit_assert_stmt(self, o: AssertStmt) -> None:
@@ -524,10 +569,11 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
     def visit_if_stmt(self, o: IfStmt) -> None:
         assert len(o.expr) == 1  # not sure why it is a list
         cond = o.expr[0].accept(self)
-        print(f"if stmt with cond {cond}")
+        if self.log:
+            print(f"if stmt with cond {cond}")
 
         # clone the current state
-        c_state = copy.deepcopy(self.state)
+        c_state = self.state.copy()
         c_state.precond.append(cond)
         consequent = VCVisitor(  # type: ignore  # ignore the abstract expr visit methods that aren't implemented for now in VCVisitor
             self.fn_name,
@@ -542,8 +588,9 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
             self.inv_grammar,
             self.ps_grammar,
             self.types,
+            self.log,
         )
-        a_state = copy.deepcopy(self.state)
+        a_state = self.state.copy()
         a_state.precond.append(Not(cond))
         alternate = VCVisitor(  # type: ignore  # ignore the abstract expr visit methods that aren't implemented for now in VCVisitor
             self.fn_name,
@@ -558,6 +605,7 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
             self.inv_grammar,
             self.ps_grammar,
             self.types,
+            self.log,
         )
 
         for s in o.body:
@@ -595,7 +643,8 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
                 else:
                     self.state.vars[v] = c_e
 
-            print(f"merged state: {self.state.vars}")
+            if self.log:
+                print(f"merged state: {self.state.vars}")
 
     def visit_break_stmt(self, o: BreakStmt) -> None:
         raise NotImplementedError()
@@ -635,42 +684,26 @@ class VCVisitor(StatementVisitor[None], ExpressionVisitor[Expr]):
             )
         return e
 
-    # ">" | "<" | "==" | ">=" | "<=" | "!=" | "is" ["not"] | ["not"] "in"
     def process_comparison(self, op: str, left: Expr, right: Expr) -> Expr:
-        if op == ">":
-            return Gt(left, right)
-        elif op == "<":
-            return Lt(left, right)
-        elif op == "==":
-            return Eq(left, right)
-        elif op == ">=":
-            return Ge(left, right)
-        elif op == "<=":
-            return Le(left, right)
-        else:
+        mk = _CMP_OPS.get(op)
+        if mk is None:
             raise RuntimeError(f"NYI: {op}")
+        return mk(left, right)
 
     # binary expr
     def visit_op_expr(self, o: OpExpr) -> Expr:
         l = o.left.accept(self)
         r = o.right.accept(self)
         op = o.op
-        if op == "+":
-            return l + r
-        elif op == "-":
-            return l - r
-        elif op == "*":
-            return l * r
-        elif op == "/":
-            raise NotImplementedError(f"Division not supported in {o}")
-        elif op == "%":
-            raise NotImplementedError(f"Modulo not supported in {o}")
-        elif op == "and":
-            return And(l, r)
-        elif op == "or":
-            return Or(l, r)
-        else:
-            raise RuntimeError(f"unknown binary op: {op} in {o}")
+        mk = _BIN_OPS.get(op)
+        if mk is None:
+            if op == "/":
+                raise NotImplementedError(f"Division not supported in {o}")
+            elif op == "%":
+                raise NotImplementedError(f"Modulo not supported in {o}")
+            else:
+                raise RuntimeError(f"unknown binary op: {op} in {o}")
+        return mk(l, r)
 
     # def visit(self, o: MypyNode) -> bool:
     #     print("contains2: %s" % self.lookup_type_or_none(o))
@@ -685,13 +718,15 @@ class Driver:
     postconditions: List[Expr]
     fns: Dict[str, "MetaliftFunc"]  # maps analyzed function names to returned object
     target_fn: Callable[[], List[FnDecl]]
+    log: bool
 
-    def __init__(self) -> None:
+    def __init__(self, log: bool = True) -> None:
         self.var_tracker = VariableTracker()
         self.inv_tracker = PredicateTracker()
         self.asserts = []
         self.postconditions = []
         self.fns = dict()
+        self.log = log
 
     def variable(self, name: str, type: MLType) -> Var:
         return self.var_tracker.variable(name, type)
@@ -723,7 +758,8 @@ class Driver:
     def synthesize(self) -> None:
         synths = [i.gen_Synth() for i in self.inv_tracker.predicates.values()]
 
-        print("asserts: %s" % self.asserts)
+        if self.log:
+            print("asserts: %s" % self.asserts)
         vc = And(*self.asserts)
 
         target = []
@@ -813,6 +849,7 @@ class MetaliftFunc:
             self.inv_grammar,
             self.ps_grammar,
             self.types,
+            self.driver.log,
         )
 
         self.ast.accept(v)
@@ -21,6 +21,8 @@ class CVC5UnsupportedException(Exception):
 
 
 class Type:
+    __slots__ = ("name", "args")
+
     def __init__(self, name: str, *args: "Type") -> None:
         self.name = name
         self.args = args
@@ -151,6 +153,8 @@ T = TypeVar("T")
 
 
 class Expr:
+    __slots__ = ("args", "type")
+
     def __init__(self, type: Type, args: Any) -> None:
         self.args = args
         self.type = type
@@ -378,20 +382,22 @@ class Expr:
 
     @staticmethod
     def toRosetteSimple(e: "Expr", value: str) -> str:
-        retStr = "(" + value + " "
+        # collect parts and join once: += on strings reallocates the whole
+        # prefix per argument, which is quadratic for wide expressions
+        parts = ["(" + value + " "]
         for a in e.args:
             if isinstance(a, ValueRef) and a.name != "":
-                retStr += "%s" % (a.name) + " "
+                parts.append("%s" % (a.name) + " ")
             else:
                 strExp = a.toRosette() if isinstance(a, Expr) else str(a)
                 if (strExp) in Expr.listFns.keys() and "list_empty" in (strExp):
-                    retStr += "(" + Expr.listFns[strExp] + ")" + " "
+                    parts.append("(" + Expr.listFns[strExp] + ")" + " ")
                 elif (strExp) in Expr.listFns.keys():
-                    retStr += Expr.listFns[strExp]
+                    parts.append(Expr.listFns[strExp])
                 else:
-                    retStr += strExp + " "
-        retStr += ")"
-        return retStr
+                    parts.append(strExp + " ")
+        parts.append(")")
+        return "".join(parts)
 
     def simplify(self) -> "Expr":
         self = self.mapArgs(lambda a: a.simplify() if isinstance(a, Expr) else a)
@@ -526,6 +532,8 @@ class Expr:
 
 
 class Var(Expr):
+    __slots__ = ()
+
     def __init__(self, name: str, ty: Type) -> None:
         Expr.__init__(self, ty, [name])
 
@@ -549,6 +557,7 @@ class Var(Expr):
 
 # used in defining grammars
 class NonTerm(Var):
+    __slots__ = ("isStart",)
     currentNum = 0  # current non terminal number
 
     def __init__(self, t: Type, isStart: bool = False, name: str = "") -> None:
@@ -563,6 +572,8 @@ class NonTerm(Var):
 
 
 class Lit(Expr):
+    __slots__ = ()
+
     def __init__(self, val: Union[bool, int, str], ty: Type) -> None:
         Expr.__init__(self, ty, [val])
 
@@ -588,6 +599,8 @@ class Lit(Expr):
 
 
 class Object(Expr):
+    __slots__ = ()
+
     def __init__(self, ty: Type) -> None:
         Expr.__init__(self, ty, {})
 
@@ -616,6 +629,7 @@ def BoolLit(val: bool) -> Expr:
 
 
 class Add(Expr):
+    __slots__ = ()
     RosetteName = SMTName = "+"
 
     def __init__(self, *args: Expr) -> None:
@@ -641,6 +655,7 @@ class Add(Expr):
 
 
 class Sub(Expr):
+    __slots__ = ()
     RosetteName = SMTName = "-"
 
     def __init__(self, *args: Expr) -> None:
@@ -666,6 +681,7 @@ class Sub(Expr):
 
 
 class Mul(Expr):
+    __slots__ = ()
     RosetteName = SMTName = "*"
 
     def __init__(self, *args: Expr) -> None:
@@ -691,6 +707,7 @@ class Mul(Expr):
 
 
 class Eq(Expr):
+    __slots__ = ()
     RosetteName = "equal?"
     SMTName = "="
 
@@ -721,6 +738,7 @@ class Eq(Expr):
 
 
 class Lt(Expr):
+    __slots__ = ()
     RosetteName = SMTName = "<"
 
     def __init__(self, e1: Expr, e2: Expr) -> None:
@@ -749,6 +767,7 @@ class Lt(Expr):
 
 
 class Le(Expr):
+    __slots__ = ()
     RosetteName = SMTName = "<="
 
     def __init__(self, e1: Expr, e2: Expr) -> None:
@@ -777,6 +796,7 @@ class Le(Expr):
 
 
 class Gt(Expr):
+    __slots__ = ()
     RosetteName = SMTName = ">"
 
     def __init__(self, e1: Expr, e2: Expr) -> None:
@@ -805,6 +825,7 @@ class Gt(Expr):
 
 
 class Ge(Expr):
+    __slots__ = ()
     RosetteName = SMTName = ">="
 
     def __init__(self, e1: Expr, e2: Expr) -> None:
@@ -833,6 +854,7 @@ class Ge(Expr):
 
 
 class And(Expr):
+    __slots__ = ()
     RosetteName = "&&"  # racket "and" short circuits!
     SMTName = "and"
 
@@ -856,6 +878,7 @@ class And(Expr):
 
 
 class Or(Expr):
+    __slots__ = ()
     # XXX we should use || for rosette to avoid short circuiting
     RosetteName = SMTName = "or"
 
@@ -881,6 +904,7 @@ class Or(Expr):
 
 
 class Not(Expr):
+    __slots__ = ()
     RosetteName = "!"
     SMTName = "not"
 
@@ -902,6 +926,7 @@ class Not(Expr):
 
 
 class Implies(Expr):
+    __slots__ = ()
     RosetteName = SMTName = "=>"
 
     def __init__(self, e1: Union[Expr, "MLInst"], e2: Union[Expr, "MLInst"]) -> None:
@@ -924,6 +949,7 @@ class Implies(Expr):
 
 
 class Ite(Expr):
+    __slots__ = ()
     RosetteName = "if"
     SMTName = "ite"
 
@@ -960,6 +986,8 @@ class Ite(Expr):
 
 
 class Let(Expr):
+    __slots__ = ()
+
     def __init__(self, v: Expr, e: Expr, e2: Expr) -> None:
         Expr.__init__(self, e2.type, [v, e, e2])
 
@@ -997,6 +1025,8 @@ class Let(Expr):
 
 
 class Call(Expr):
+    __slots__ = ()
+
     def __init__(self, name: str, returnT: Type, *arguments: Expr) -> None:
         Expr.__init__(self, returnT, [name, *arguments])
 
@@ -1025,13 +1055,13 @@ class Call(Expr):
             if isinstance(self.args[0], str) and (
                 self.args[0].startswith("inv") or self.args[0].startswith("ps")
             ):
-                callStr = "( " + "%s " % (str(self.args[0]))
+                callParts = ["( " + "%s " % (str(self.args[0]))]
                 for a in self.args[1:]:
-                    callStr += a.toRosette() + " "
-                callStr += ")"
-                return callStr
+                    callParts.append(a.toRosette() + " ")
+                callParts.append(")")
+                return "".join(callParts)
             elif isinstance(self.args[0], str) and self.args[0].startswith("list"):
-                callStr = (
+                callParts = [
                     "("
                     + "%s"
                     % (
@@ -1040,14 +1070,14 @@ class Call(Expr):
                         else self.args[0]
                     )
                     + " "
-                )
+                ]
                 for a in self.args[1:]:
                     if isinstance(a, ValueRef) and a.name != "":
-                        callStr += "%s " % (a.name)
+                        callParts.append("%s " % (a.name))
                     else:
-                        callStr += a.toRosette() + " "
-                callStr += ")"
-                return callStr
+                        callParts.append(a.toRosette() + " ")
+                callParts.append(")")
+                return "".join(callParts)
             else:
                 return (
                     "("
@@ -1127,6 +1157,8 @@ class Call(Expr):
 
 
 class CallValue(Expr):
+    __slots__ = ()
+
     def __init__(self, value: Expr, *arguments: Expr) -> None:
         Expr.__init__(self, value.type.args[0], [value, *arguments])
 
@@ -1143,13 +1175,13 @@ class CallValue(Expr):
             if isinstance(self.args[0], str) and (
                 self.args[0].startswith("inv") or self.args[0].startswith("ps")
             ):
-                callStr = "( " + "%s " % (str(self.args[0]))
+                callParts = ["( " + "%s " % (str(self.args[0]))]
                 for a in self.args[1:]:
-                    callStr += a.toRosette() + " "
-                callStr += ")"
-                return callStr
+                    callParts.append(a.toRosette() + " ")
+                callParts.append(")")
+                return "".join(callParts)
             elif isinstance(self.args[0], str) and self.args[0].startswith("list"):
-                callStr = (
+                callParts = [
                     "("
                     + "%s"
                     % (
@@ -1158,14 +1190,14 @@ class CallValue(Expr):
                         else self.args[0]
                     )
                     + " "
-                )
+                ]
                 for a in self.args[1:]:
                     if isinstance(a, ValueRef) and a.name != "":
-                        callStr += "%s " % (a.name)
+                        callParts.append("%s " % (a.name))
                     else:
-                        callStr += a.toRosette() + " "
-                callStr += ")"
-                return callStr
+                        callParts.append(a.toRosette() + " ")
+                callParts.append(")")
+                return "".join(callParts)
             else:
                 return (
                     "("
@@ -1245,6 +1277,7 @@ class CallValue(Expr):
 
 
 class Assert(Expr):
+    __slots__ = ()
     RosetteName = SMTName = "assert"
 
     def __init__(self, e: Expr) -> None:
@@ -1266,6 +1299,7 @@ class Assert(Expr):
 
 
 class Constraint(Expr):
+    __slots__ = ()
     SMTName = "constraint"
 
     def __init__(self, e: Expr) -> None:
@@ -1288,6 +1322,8 @@ class Constraint(Expr):
 
 ## tuple functions
 class Tuple(Expr):
+    __slots__ = ()
+
     def __init__(self, *args: Expr) -> None:
         Expr.__init__(self, TupleT(*[a.type for a in args]), args)
 
@@ -1312,6 +1348,8 @@ class Tuple(Expr):
 
 
 class TupleGet(Expr):
+    __slots__ = ()
+
     def __init__(self, t: Expr, i: Expr) -> None:
         Expr.__init__(self, t.type.args[i.args[0]], [t, i])
 
@@ -1339,6 +1377,8 @@ class TupleGet(Expr):
 
 
 class Axiom(Expr):
+    __slots__ = ()
+
     def __init__(self, e: Expr, *vars: Expr) -> None:
         Expr.__init__(self, Bool(), [e, *vars])
 
@@ -1363,6 +1403,8 @@ class Axiom(Expr):
 
 # the body of a synth-fun
 class Synth(Expr):
+    __slots__ = ()
+
     def __init__(self, name: str, body: Expr, *args: Expr) -> None:
         Expr.__init__(self, body.type, [name, body, *args])
 
@@ -1476,6 +1518,8 @@ class Synth(Expr):
 
 
 class Choose(Expr):
+    __slots__ = ()
+
     def __init__(self, *args: Expr) -> None:
         if not all(parseTypeRef(a.type) == parseTypeRef(args[0].type) for a in args):
             raise Exception(
@@ -1524,6 +1568,8 @@ class Choose(Expr):
 
 
 class FnDeclRecursive(Expr):
+    __slots__ = ()
+
     def __init__(
         self, name: str, returnT: Type, body: Union[Expr, str], *args: Expr
     ) -> None:
@@ -1600,6 +1646,8 @@ class FnDeclRecursive(Expr):
 
 
 class FnDefine(Expr):
+    __slots__ = ()
+
     def __init__(self, name: str, returnT: Type, *args: Expr) -> None:
         Expr.__init__(self, FnT(returnT, *[a.type for a in args]), [name, *args])
 
@@ -1630,6 +1678,8 @@ class FnDefine(Expr):
 
 
 class Lambda(Expr):
+    __slots__ = ()
+
     def __init__(self, returnT: Type, body: Expr, *args: Expr) -> None:
         Expr.__init__(self, FnT(returnT, *[a.type for a in args]), [body, *args])
 
@@ -1665,6 +1715,8 @@ class Lambda(Expr):
 
 
 class FnDecl(Expr):
+    __slots__ = ()
+
     def __init__(
         self, name: str, returnT: Type, body: Union[Expr, str], *args: Expr
     ) -> None:
@@ -1741,6 +1793,7 @@ class FnDecl(Expr):
 
 
 class TargetCall(Call):
+    __slots__ = ("_codegen",)
     _codegen: Optional[Callable[[Expr], str]]
 
     def __init__(
@@ -1761,6 +1814,7 @@ class TargetCall(Call):
 
 
 class Target(FnDecl):
+    __slots__ = ("semantics", "_codegen")
     definedFns: Dict[str, "Target"] = {}  # stores all fns that have been defined so far
 
     semantics: Optional[Callable[[Expr], Expr]]
@@ -1791,6 +1845,8 @@ class Target(FnDecl):
 
 # class to represent the extra instructions that are inserted into the llvm code during analysis
 class MLInst:
+    __slots__ = ("opcode", "operands", "name")
+
     class Kind:  # not defined as an enum as computeVC switches on the opcode str
         Assert = "assert"
         Assume = "assume"
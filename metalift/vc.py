@@ -10,7 +10,11 @@ from metalift import vc_util, models
 from llvmlite.binding import TypeRef, ValueRef
 
 import typing
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Union, cast
+
+# compiled once: these run for every alloca/icmp instruction in the program
+_ALLOCA_RE = re.compile("alloca ([^$|,]+)")
+_ICMP_RE = re.compile("\S+ = icmp (\w+) \S+ \S+ \S+")
 
 
 class State:
@@ -63,10 +67,12 @@ class Block:
 class VC:
     preds: Dict[str, Expr]
     vars: typing.Set[Var]
+    var_keys: typing.Set[typing.Tuple[str, Type]]
     log: bool
 
     def __init__(self, fnName: str = "ps", log: bool = True) -> None:
         self.vars = set()
+        self.var_keys = set()  # (name, type) pairs mirroring self.vars
         self.havocNum = 0
         self.preds = dict()
         self.fnName = fnName
@@ -81,8 +87,11 @@ class VC:
             raise Exception("NYI %s with type %s" % (name, ty))
 
         e = Var(self.fnName + "_" + name, ty)
-        found = any(v.args[0] == e.args[0] and v.type == ty for v in self.vars)
-        if not found:
+        # dedup through the key set: scanning self.vars per call is O(n)
+        # and makeVar runs once per register reference
+        key = (e.args[0], ty)
+        if key not in self.var_keys:
+            self.var_keys.add(key)
             self.vars.add(e)
 
         return e
@@ -305,8 +314,8 @@ class VC:
 
     def compute(self, b: Block) -> State:
         s = self.mergeStates(b.preds) if b.preds else b.state
-        assigns = set()
-        asserts = list()
+        assigns: typing.Set[ValueRef] = set()
+        asserts: typing.List[Expr] = list()
 
         if self.log:
             print("block: %s" % b.name)
@@ -314,166 +323,12 @@ class VC:
             if self.log:
                 print("inst: %s" % i)
 
-            opcode = i.opcode
-            ops = list(i.operands)
-
-            if opcode == "alloca":
-                # alloca <type>, align <num> or alloca <type>
-                t = re.search("alloca ([^$|,]+)", str(i)).group(  # type: ignore
-                    1
-                )  # bug: ops[0] always return i32 1 regardless of type
-                if t == "i32":
-                    s.mem[i] = Lit(0, Int())
-                elif t == "i8":
-                    s.mem[i] = Lit(False, Bool())
-                elif t == "i1":
-                    s.mem[i] = Lit(False, Bool())
-                elif t == "%struct.list*":
-                    s.mem[i] = Lit(0, ListT(Int()))
-                elif t.startswith("%struct.set"):
-                    s.mem[i] = Lit(0, SetT(Int()))
-                elif t.startswith("%struct.tup."):
-                    retType = [Int() for i in range(int(t[-2]) + 1)]
-                    s.mem[i] = Lit(0, TupleT(*retType))
-                elif t.startswith("%struct.tup"):
-                    s.mem[i] = Lit(0, TupleT(Int(), Int()))
-                elif t.startswith(
-                    "%struct."
-                ):  # not a tuple or set, assume to be user defined type
-                    o = re.search("%struct.(.+)", t)
-                    if o:
-                        tname = o.group(1)
-                    else:
-                        raise Exception("failed to match struct %s: " % t)
-
-                    s.mem[i] = Object(Type(tname))
-                else:
-                    raise Exception("NYI: %s" % i)
-
-            elif opcode == "load":
-                s.regs[i] = s.mem[ops[0]]
-                assigns.add(i)
-
-            elif opcode == "store":
-                # store either a reg or a literal
-                s.mem[ops[1]] = VC.parseOperand(ops[0], s.regs)
-
-            elif opcode in ("add", "sub", "mul"):
-                op1 = VC.parseOperand(ops[0], s.regs)
-                op2 = VC.parseOperand(ops[1], s.regs)
-                if opcode == "add":
-                    s.regs[i] = Add(op1, op2)
-                elif opcode == "sub":
-                    s.regs[i] = Sub(op1, op2)
-                elif opcode == "mul":
-                    s.regs[i] = Mul(op1, op2)
-
-            elif opcode == "icmp":
-                cond = re.match("\S+ = icmp (\w+) \S+ \S+ \S+", str(i).strip()).group(1)  # type: ignore
-                op1 = VC.parseOperand(ops[0], s.regs)
-                op2 = VC.parseOperand(ops[1], s.regs)
-
-                if cond == "eq":
-                    r: Expr = Eq(op2, op1)
-                elif cond == "ne":
-                    r = Not(Eq(op2, op1))
-                elif cond == "sgt":
-                    r = Lt(op2, op1)
-                elif cond == "sle":
-                    r = Le(op1, op2)
-                elif cond == "slt" or cond == "ult":
-                    r = Lt(op1, op2)
-                else:
-                    raise Exception("NYI %s" % cond)
-
-                s.regs[i] = r
-                assigns.add(i)
-
-            elif opcode == "br" or opcode == "ret" or opcode == "switch":
-                pass
-
-            elif opcode == "bitcast" or opcode == "sext":
-                # XXX: this is a hack. bitcast should operate on reg values.
-                # this is because we currently do not assign out numerical addresses that are stored in regs
-                if ops[0] in s.regs:
-                    s.regs[i] = VC.parseOperand(ops[0], s.regs)
-                else:
-                    s.mem[i] = VC.parseOperand(ops[0], s.mem)
-
-            elif opcode == "call":  # last arg is fn to be called
-                fnName = ops[-1] if isinstance(ops[-1], str) else ops[-1].name
-                if fnName == "":
-                    # TODO(shadaj): this is a hack around LLVM bitcasting the function before calling it on aarch64
-                    fnName = str(ops[-1]).split("@")[-1].split(" ")[0]
-                if fnName in models.fnModels:
-                    rv = models.fnModels[fnName](s.regs, s.mem, s.gvars, *ops[:-1])
-                    if rv.val:
-                        s.regs[i] = rv.val
-                        assigns.add(i)
-                    if rv.assigns:
-                        for k, v in rv.assigns:
-                            s.regs[k] = v
-                            assigns.add(k)
-
-                elif fnName in s.uninterpFuncs:
-                    s.regs[i] = Call(
-                        fnName, parseTypeRef(i.type), *[s.regs[op] for op in ops[:-1]]
-                    )
-                    assigns.add(i)
-
-                # elif fnName == "setField":
-                #     (fieldName, obj, val, fname) = ops
-                #     print("%s %s to %s" % (fname, obj, val))
-                #     s.mem[obj].args[fieldName.args[0]] = s.regs[val]
-                #
-                # elif fnName == "getField":
-                #     (fieldName, obj, fname) = ops
-                #     print("get %s %s" % (fname, s.mem[obj].args[fieldName.args[0]]))
-                #     s.regs[i] = s.mem[obj].args[fieldName.args[0]]
-                #     print("get to %s %s" % (i, s.regs[i]))
-
-                else:
-                    raise Exception("NYI: %s, name: %s" % (i, fnName))
-
-            elif opcode == "assert":
-                e = VC.evalMLInst(ops[0], s.regs, s.mem)
-                # e = ops[0]
-                # if e.opcode == "call":
-                #   name = e.operands[-1]
-                #   if name.startswith("inv"):
-                #     parsed = [VC.evalMLInst(arg, s.regs, s.mem) for arg in e.operands[0:-1]]
-                #     e = self.callPred(name, Bool(), *parsed)
-                #     #parsed = VC.parseExpr(e, s.regs, s.mem)
-                #     #e = self.callPred(parsed.args[0], parsed.type, *parsed.args[1:])
-                #
-                #   elif name == "ps":
-                #     parsed = [VC.evalMLInst(arg, s.regs, s.mem) for arg in e.operands[0:-1]]
-                #     e = self.callPred(name, Bool(), *parsed)
-                #
-                #     # parsed = VC.evalMLInst(e, s.regs, s.mem)
-                #     # e = self.callPred(parsed.args[0], parsed.type, *parsed.args[1:])
-                #   else: raise Exception("NYI: %s" % i)
-                # else: raise Exception("NYI: %s" % i)
-
-                asserts.append(e)
-
-            elif opcode == "assume":
-                s.assumes.append(VC.evalMLInst(ops[0], s.regs, s.mem))  # type: ignore
-                # if isinstance(ops[0], MLInstruction):
-                #   s.assumes.append(VC.evalMLInst(ops[0], s.regs, s.mem))
-                # elif isinstance(ops[0], ValueRef):
-                #   s.assumes.append(VC.parseOperand(ops[0], s.regs))
-                # else: raise Exception("NYI: %s" % i)
-
-            elif opcode == "havoc":
-                for op in ops:
-                    s.mem[op] = self.makeVar(
-                        "%s_%s" % (op.name, self.havocNum), s.mem[op].type
-                    )
-                    self.havocNum = self.havocNum + 1
-
-            else:
+            # opcode -> bound method, precomputed in the class-level table below
+            # so the hot loop does a single dict lookup per instruction
+            handler = VC.instHandlers.get(i.opcode)
+            if handler is None:
                 raise Exception("NYI: %s" % i)
+            handler(self, i, list(i.operands), s, assigns, asserts)
 
         s.vc = self.formVC(b.name, s.regs, assigns, s.assumes, asserts, b.succs)
 
@@ -482,6 +337,253 @@ class VC:
         b.state = s
         return s
 
+    def computeAlloca(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        # alloca <type>, align <num> or alloca <type>
+        t = _ALLOCA_RE.search(str(i)).group(  # type: ignore
+            1
+        )  # bug: ops[0] always return i32 1 regardless of type
+        if t == "i32":
+            s.mem[i] = Lit(0, Int())
+        elif t == "i8":
+            s.mem[i] = Lit(False, Bool())
+        elif t == "i1":
+            s.mem[i] = Lit(False, Bool())
+        elif t == "%struct.list*":
+            s.mem[i] = Lit(0, ListT(Int()))
+        elif t.startswith("%struct.set"):
+            s.mem[i] = Lit(0, SetT(Int()))
+        elif t.startswith("%struct.tup."):
+            retType = [Int() for _ in range(int(t[-2]) + 1)]
+            s.mem[i] = Lit(0, TupleT(*retType))
+        elif t.startswith("%struct.tup"):
+            s.mem[i] = Lit(0, TupleT(Int(), Int()))
+        elif t.startswith(
+            "%struct."
+        ):  # not a tuple or set, assume to be user defined type
+            o = re.search("%struct.(.+)", t)
+            if o:
+                tname = o.group(1)
+            else:
+                raise Exception("failed to match struct %s: " % t)
+
+            s.mem[i] = Object(Type(tname))
+        else:
+            raise Exception("NYI: %s" % i)
+
+    def computeLoad(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        s.regs[i] = s.mem[ops[0]]
+        assigns.add(i)
+
+    def computeStore(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        # store either a reg or a literal
+        s.mem[ops[1]] = VC.parseOperand(ops[0], s.regs)
+
+    arithOps: Dict[str, Callable[..., Expr]] = {"add": Add, "sub": Sub, "mul": Mul}
+
+    def computeArith(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        op1 = VC.parseOperand(ops[0], s.regs)
+        op2 = VC.parseOperand(ops[1], s.regs)
+        s.regs[i] = VC.arithOps[i.opcode](op1, op2)
+
+    def computeIcmp(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        cond = _ICMP_RE.match(str(i).strip()).group(1)  # type: ignore
+        op1 = VC.parseOperand(ops[0], s.regs)
+        op2 = VC.parseOperand(ops[1], s.regs)
+
+        if cond == "eq":
+            r: Expr = Eq(op2, op1)
+        elif cond == "ne":
+            r = Not(Eq(op2, op1))
+        elif cond == "sgt":
+            r = Lt(op2, op1)
+        elif cond == "sle":
+            r = Le(op1, op2)
+        elif cond == "slt" or cond == "ult":
+            r = Lt(op1, op2)
+        else:
+            raise Exception("NYI %s" % cond)
+
+        s.regs[i] = r
+        assigns.add(i)
+
+    def computeJump(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        pass  # br, ret, and switch are handled by the block successors
+
+    def computeCast(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        # XXX: this is a hack. bitcast should operate on reg values.
+        # this is because we currently do not assign out numerical addresses that are stored in regs
+        if ops[0] in s.regs:
+            s.regs[i] = VC.parseOperand(ops[0], s.regs)
+        else:
+            s.mem[i] = VC.parseOperand(ops[0], s.mem)
+
+    def computeCall(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        # last arg is fn to be called
+        fnName = ops[-1] if isinstance(ops[-1], str) else ops[-1].name
+        if fnName == "":
+            # TODO(shadaj): this is a hack around LLVM bitcasting the function before calling it on aarch64
+            fnName = str(ops[-1]).split("@")[-1].split(" ")[0]
+        if fnName in models.fnModels:
+            rv = models.fnModels[fnName](s.regs, s.mem, s.gvars, *ops[:-1])
+            if rv.val:
+                s.regs[i] = rv.val
+                assigns.add(i)
+            if rv.assigns:
+                for k, v in rv.assigns:
+                    s.regs[k] = v
+                    assigns.add(k)
+
+        elif fnName in s.uninterpFuncs:
+            s.regs[i] = Call(
+                fnName, parseTypeRef(i.type), *[s.regs[op] for op in ops[:-1]]
+            )
+            assigns.add(i)
+
+        # elif fnName == "setField":
+        #     (fieldName, obj, val, fname) = ops
+        #     print("%s %s to %s" % (fname, obj, val))
+        #     s.mem[obj].args[fieldName.args[0]] = s.regs[val]
+        #
+        # elif fnName == "getField":
+        #     (fieldName, obj, fname) = ops
+        #     print("get %s %s" % (fname, s.mem[obj].args[fieldName.args[0]]))
+        #     s.regs[i] = s.mem[obj].args[fieldName.args[0]]
+        #     print("get to %s %s" % (i, s.regs[i]))
+
+        else:
+            raise Exception("NYI: %s, name: %s" % (i, fnName))
+
+    def computeAssert(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        e = cast(Expr, VC.evalMLInst(ops[0], s.regs, s.mem))
+        # e = ops[0]
+        # if e.opcode == "call":
+        #   name = e.operands[-1]
+        #   if name.startswith("inv"):
+        #     parsed = [VC.evalMLInst(arg, s.regs, s.mem) for arg in e.operands[0:-1]]
+        #     e = self.callPred(name, Bool(), *parsed)
+        #     #parsed = VC.parseExpr(e, s.regs, s.mem)
+        #     #e = self.callPred(parsed.args[0], parsed.type, *parsed.args[1:])
+        #
+        #   elif name == "ps":
+        #     parsed = [VC.evalMLInst(arg, s.regs, s.mem) for arg in e.operands[0:-1]]
+        #     e = self.callPred(name, Bool(), *parsed)
+        #
+        #     # parsed = VC.evalMLInst(e, s.regs, s.mem)
+        #     # e = self.callPred(parsed.args[0], parsed.type, *parsed.args[1:])
+        #   else: raise Exception("NYI: %s" % i)
+        # else: raise Exception("NYI: %s" % i)
+
+        asserts.append(e)
+
+    def computeAssume(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        s.assumes.append(VC.evalMLInst(ops[0], s.regs, s.mem))  # type: ignore
+        # if isinstance(ops[0], MLInstruction):
+        #   s.assumes.append(VC.evalMLInst(ops[0], s.regs, s.mem))
+        # elif isinstance(ops[0], ValueRef):
+        #   s.assumes.append(VC.parseOperand(ops[0], s.regs))
+        # else: raise Exception("NYI: %s" % i)
+
+    def computeHavoc(
+        self,
+        i: ValueRef,
+        ops: typing.List[ValueRef],
+        s: State,
+        assigns: typing.Set[ValueRef],
+        asserts: typing.List[Expr],
+    ) -> None:
+        for op in ops:
+            s.mem[op] = self.makeVar("%s_%s" % (op.name, self.havocNum), s.mem[op].type)
+            self.havocNum = self.havocNum + 1
+
+    instHandlers: Dict[str, Callable[..., None]] = {
+        "alloca": computeAlloca,
+        "load": computeLoad,
+        "store": computeStore,
+        "add": computeArith,
+        "sub": computeArith,
+        "mul": computeArith,
+        "icmp": computeIcmp,
+        "br": computeJump,
+        "ret": computeJump,
+        "switch": computeJump,
+        "bitcast": computeCast,
+        "sext": computeCast,
+        "call": computeCall,
+        "assert": computeAssert,
+        "assume": computeAssume,
+        "havoc": computeHavoc,
+    }
+
     # evaluate a ML instruction. returns an IR Expr
     @staticmethod
     def evalMLInst(
@@ -4,6 +4,9 @@ from llvmlite.binding import ValueRef
 from metalift.ir import Expr, Lit, Bool, Int
 from typing import Dict
 
+# compiled once: parseOperand runs for every instruction operand
+_TYPED_OPERAND_RE = re.compile("\w+ (\S+)")
+
 
 def parseOperand(op: ValueRef, reg: Dict[ValueRef, Expr], hasType: bool = True) -> Expr:
     # op is a ValueRef, and if it has a name then it's a register
@@ -17,7 +20,7 @@ def parseOperand(op: ValueRef, reg: Dict[ValueRef, Expr], hasType: bool = True)
                     return reg[regKey]
             raise KeyError("")
     elif hasType:  # i32 0
-        val = re.search("\w+ (\S+)", str(op)).group(1)  # type: ignore
+        val = _TYPED_OPERAND_RE.search(str(op)).group(1)  # type: ignore
         if val == "true":
             return Lit(True, Bool())
         elif val == "false":